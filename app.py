@@ -1,12 +1,12 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 from datetime import date
-from dateutil.relativedelta import relativedelta
 
 from backtest.data import get_data
 from backtest.engine import run_backtest
 from backtest.portfolio import Portfolio
-from backtest.metrics import calculate_cagr, calculate_sharpe_ratio, calculate_max_drawdown, calculate_volatility
+from backtest.metrics import calculate_all_metrics
 from backtest.risk import generate_risk_report
 from backtest.plotting import generate_contribution_plots
 from backtest.forecasting import run_monte_carlo_simulation
@@ -115,18 +115,20 @@ if run_button:
         # --- Performance Metrics ---
         st.header("Performance Metrics")
         col1, col2 = st.columns(2)
+        portfolio_metrics = calculate_all_metrics(portfolio_value['Portfolio Value'])
+        benchmark_metrics = calculate_all_metrics(benchmark_value['Benchmark Value (SPY)'])
         with col1:
             st.subheader("Your Portfolio")
-            st.metric("CAGR", f"{calculate_cagr(portfolio_value['Portfolio Value']):.2%}")
-            st.metric("Annual Volatility", f"{calculate_volatility(portfolio_value['Portfolio Value']):.2%}")
-            st.metric("Sharpe Ratio", f"{calculate_sharpe_ratio(portfolio_value['Portfolio Value']):.2f}")
-            st.metric("Max Drawdown", f"{calculate_max_drawdown(portfolio_value['Portfolio Value']):.2%}")
+            st.metric("CAGR", f"{portfolio_metrics['cagr']:.2%}")
+            st.metric("Annual Volatility", f"{portfolio_metrics['volatility']:.2%}")
+            st.metric("Sharpe Ratio", f"{portfolio_metrics['sharpe_ratio']:.2f}")
+            st.metric("Max Drawdown", f"{portfolio_metrics['max_drawdown']:.2%}")
         with col2:
             st.subheader("Benchmark (SPY)")
-            st.metric("CAGR", f"{calculate_cagr(benchmark_value['Benchmark Value (SPY)']):.2%}")
-            st.metric("Annual Volatility", f"{calculate_volatility(benchmark_value['Benchmark Value (SPY)']):.2%}")
-            st.metric("Sharpe Ratio", f"{calculate_sharpe_ratio(benchmark_value['Benchmark Value (SPY)']):.2f}")
-            st.metric("Max Drawdown", f"{calculate_max_drawdown(benchmark_value['Benchmark Value (SPY)']):.2%}")
+            st.metric("CAGR", f"{benchmark_metrics['cagr']:.2%}")
+            st.metric("Annual Volatility", f"{benchmark_metrics['volatility']:.2%}")
+            st.metric("Sharpe Ratio", f"{benchmark_metrics['sharpe_ratio']:.2f}")
+            st.metric("Max Drawdown", f"{benchmark_metrics['max_drawdown']:.2%}")
 
         # --- Risk Analysis ---
         if len(user_tickers) > 1:
@@ -135,11 +137,11 @@ if run_button:
                 st.warning("Time period is short (< 1 year). Risk metrics may be less reliable.")
             
             risk_metrics, corr_fig = generate_risk_report(portfolio_data, normalized_weights)
-            if risk_metrics and corr_fig:
+            if risk_metrics and corr_fig is not None:
                 r_col1, r_col2 = st.columns(2)
                 r_col1.metric("Portfolio Annualized Volatility", f"{risk_metrics['volatility']:.2%}")
                 r_col2.metric("Risk from Main Driver (PC1)", f"{risk_metrics['pc1_contribution']:.2%}")
-                st.pyplot(corr_fig)
+                st.plotly_chart(corr_fig, use_container_width=True)
             else:
                 st.info("Risk analysis could not be performed due to insufficient data.")
         
@@ -147,22 +149,15 @@ if run_button:
         st.header("Contribution Analysis")
         
         def get_total_capital_invested(start, end, initial, monthly, increase_pa):
-            total = initial
-            current_monthly = monthly
-            
             # This logic approximates the number of contributions more simply.
             num_months = (end.year - start.year) * 12 + end.month - start.month
-            
-            if num_months > 0:
-                last_year = start.year
-                # Loop through each month of the investment period
-                for i in range(num_months):
-                    current_date = start + relativedelta(months=i+1)
-                    if current_date.year > last_year:
-                        current_monthly *= (1 + increase_pa / 100.0)
-                        last_year = current_date.year
-                    total += current_monthly
-            return total
+            if num_months <= 0:
+                return initial
+
+            # The k-th monthly contribution (k = 1..num_months) lands in the calendar year
+            # start.year + (start.month - 1 + k) // 12, and has been increased once per new year.
+            years_elapsed = (start.month - 1 + np.arange(1, num_months + 1)) // 12
+            return initial + monthly * float(np.sum((1 + increase_pa / 100.0) ** years_elapsed))
             
         total_invested = get_total_capital_invested(start_date, end_date, initial_investment, monthly_topup, annual_increase)
         final_prices = portfolio_data.iloc[-1]
@@ -177,12 +172,12 @@ if run_button:
         st.header("Future Projection")
 
         with st.spinner("Running Monte Carlo simulation..."):
-            # Calculate historical returns for the simulation
-            historical_returns = portfolio_value['Portfolio Value'].pct_change().dropna()
+            # Calculate historical asset returns for the simulation
+            asset_returns = portfolio_data.pct_change().dropna()
             last_known_value = portfolio_value['Portfolio Value'].iloc[-1]
 
             # Run the simulation
-            forecast_df = run_monte_carlo_simulation(historical_returns, projection_years, last_known_value)
+            forecast_df = run_monte_carlo_simulation(asset_returns, normalized_weights, projection_years, last_known_value)
             
             # Create the plot
             fig, ax = plt.subplots(figsize=(12, 8))
@@ -1,15 +1,36 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import yfinance as yf
 from streamlit import cache_data
 
-@cache_data
-def get_data(tickers, start_date, end_date):
+# Persistent price cache, shared across Streamlit sessions.
+CACHE_DIR = Path(os.environ.get('BACKTESTER_CACHE_DIR', Path.home() / '.cache' / 'backtester'))
+# Parquet schema metadata key holding the date range a cache file covers.
+_COVERAGE_KEY = b'backtester_coverage'
+
+def _download(tickers, start_date, end_date):
     """
     Downloads historical price data from Yahoo Finance.
-    It prioritizes 'Adj Close', but falls back to 'Close' if it's not available.
+    Tickers are fetched concurrently, and 'Close' is already adjusted for splits and dividends.
     """
     # Download the full dataset from yfinance
-    data = yf.download(tickers, start=start_date, end=end_date)
+    data = yf.download(
+        tickers,
+        start=start_date,
+        end=end_date,
+        auto_adjust=True,
+        threads=True,
+        progress=False,
+        group_by='column'
+    )
 
     if data.empty:
         # Let the caller handle the empty dataframe.
@@ -17,22 +38,149 @@ def get_data(tickers, start_date, end_date):
 
     # Case 1: Multiple tickers -> data.columns is a MultiIndex
     if isinstance(data.columns, pd.MultiIndex):
-        try:
-            # Prioritize 'Adj Close'
-            price_data = data['Adj Close']
-        except KeyError:
-            # Fallback to 'Close'
-            price_data = data['Close']
-    
+        price_data = data['Close']
+
     # Case 2: Single ticker -> data.columns is a regular Index
     else:
-        try:
-            price_data = data[['Adj Close']]
-        except KeyError:
-            price_data = data[['Close']]
-        
+        price_data = data[['Close']]
+
         # Rename the column to the ticker for consistency
         if len(tickers) == 1:
             price_data.columns = [tickers[0]]
 
-    return price_data.dropna(axis=0, how='all')
\ No newline at end of file
+    return price_data.dropna(axis=0, how='all')
+
+def _is_complete(block, tickers):
+    """
+    Returns True if a downloaded block has rows and at least one price for every ticker.
+    yfinance doesn't raise on network errors or rate limits; it returns an empty frame or
+    all-NaN columns instead, and such a block must never be recorded as covered.
+    """
+    if block.empty:
+        return False
+    return all(ticker in block.columns and block[ticker].notna().any() for ticker in tickers)
+
+def _is_valid_extension(block, cached, anchor):
+    """
+    Returns True if a block downloaded to extend the cache is usable.
+
+    Unlike a first download, a ticker may legitimately be all-NaN here (before its listing
+    date, or after delisting). The block has failed only if it is empty, has no prices at
+    all, or drops a price for a ticker that traded on the overlap day it shares with the cache.
+    """
+    if block.empty or not block.notna().to_numpy().any() or anchor not in block.index:
+        return False
+    traded = cached.loc[anchor].notna()
+    fetched = block.reindex(columns=cached.columns).loc[anchor].notna()
+    return bool((fetched | ~traded).all())
+
+def _splice(cached, fresh):
+    """
+    Joins a freshly downloaded block of prices onto the cached ones.
+
+    Adjusted prices are re-based whenever a dividend or split is paid, so the cached
+    prices are first rescaled onto the fresh block's basis using the date they share.
+    """
+    common_dates = cached.index.intersection(fresh.index)
+    if len(common_dates):
+        anchor = common_dates[0]
+        ratio = fresh.loc[anchor] / cached.loc[anchor]
+        cached = cached * ratio.where(np.isfinite(ratio), 1.0)
+
+    # Fresh prices win, but a gap in the fresh block never blanks out a cached price.
+    return fresh.combine_first(cached).sort_index()
+
+def _read_cache(path):
+    """
+    Reads a cache file, returning (prices, covered_start, covered_end), or None if it is
+    missing or unreadable.
+    """
+    if not path.exists():
+        return None
+    try:
+        table = pq.read_table(path)
+        coverage = json.loads((table.schema.metadata or {})[_COVERAGE_KEY])
+        return table.to_pandas(), pd.Timestamp(coverage['start']), pd.Timestamp(coverage['end'])
+    except (OSError, ValueError, KeyError):
+        # A corrupt cache entry is simply rebuilt.
+        return None
+
+def _write_cache(path, data, covered_start, covered_end):
+    """
+    Writes prices and their covered date range to a single parquet file.
+    The file is written to a temporary path and moved into place, so concurrent sessions
+    never see a half-written file or prices that don't match their recorded range.
+    """
+    table = pa.Table.from_pandas(data)
+    coverage = json.dumps({'start': covered_start.isoformat(), 'end': covered_end.isoformat()})
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), _COVERAGE_KEY: coverage.encode()})
+
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    os.close(fd)
+    try:
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def _fetch_cached(tickers, start_date, end_date):
+    """
+    Returns prices for [start_date, end_date) from the on-disk cache, downloading only
+    the date ranges that the cache doesn't already cover.
+    Coverage is only recorded for successful downloads; a failed extension raises
+    ValueError rather than returning a shorter range than requested.
+    """
+    start = pd.Timestamp(start_date)
+    end = pd.Timestamp(end_date)
+    # No prices exist past today, so coverage is never recorded beyond it.
+    covered_end = min(end, pd.Timestamp.today().normalize())
+
+    key = hashlib.sha1(repr(tuple(sorted(tickers))).encode()).hexdigest()
+    data_path = CACHE_DIR / f"{key}.parquet"
+
+    cached = _read_cache(data_path)
+    if cached is None or cached[0].empty:
+        data = _download(tickers, start, end)
+        if _is_complete(data, tickers):
+            _write_cache(data_path, data, start, covered_end)
+        return data[(data.index >= start) & (data.index < end)] if not data.empty else data
+
+    data, cached_start, cached_end = cached
+    new_start, new_end = cached_start, cached_end
+    if start < cached_start:
+        # Overlap by the first cached day so the two blocks can be aligned.
+        anchor = data.index[0]
+        block = _download(tickers, start, anchor + pd.Timedelta(days=1))
+        if not _is_valid_extension(block, data, anchor):
+            raise ValueError(f"Failed to fetch data before {anchor.date()} for: {', '.join(tickers)}")
+        data = _splice(data, block)
+        new_start = start
+    if end > cached_end:
+        # Overlap by the last cached day so the two blocks can be aligned.
+        anchor = data.index[-1]
+        block = _download(tickers, anchor, end)
+        if not _is_valid_extension(block, data, anchor):
+            raise ValueError(f"Failed to fetch data after {anchor.date()} for: {', '.join(tickers)}")
+        data = _splice(data, block)
+        new_end = max(covered_end, cached_end)
+
+    if (new_start, new_end) != (cached_start, cached_end):
+        _write_cache(data_path, data, new_start, new_end)
+
+    return data[(data.index >= start) & (data.index < end)]
+
+@cache_data
+def get_data(tickers, start_date, end_date):
+    """
+    Returns historical price data for the given tickers and date range.
+    Prices are served from a persistent on-disk cache, and only missing date ranges
+    are downloaded from Yahoo Finance.
+    Raises ValueError if any ticker came back without prices, so that an incomplete result
+    is never memoized and the next run retries the download.
+    """
+    price_data = _fetch_cached(tickers, start_date, end_date)
+    if not _is_complete(price_data, tickers):
+        raise ValueError(f"Failed to fetch complete data for: {', '.join(tickers)}")
+    return price_data
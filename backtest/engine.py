@@ -1,9 +1,74 @@
+import numpy as np
 import pandas as pd
+from numba import njit
 from .portfolio import Portfolio
 
+# Every fast-math flag except 'nnan'/'ninf': the price guard below must still see NaNs.
+_FASTMATH = {'nsz', 'arcp', 'contract', 'afn', 'reassoc'}
+
+def _period_change(periods: np.ndarray) -> np.ndarray:
+    """Returns a boolean mask that is True on the first day of each new period."""
+    mask = np.zeros(len(periods), dtype=bool)
+    mask[1:] = periods[1:] != periods[:-1]
+    return mask
+
+def _cash_schedule(dates: pd.DatetimeIndex, monthly_topup: float, annual_increase: float) -> np.ndarray:
+    """
+    Returns the cash injected on each trading day: the monthly top-up on the first trading
+    day of each new month, increased by `annual_increase` percent on each new year, else zero.
+    """
+    month_change = _period_change(dates.month.to_numpy())
+    year_change = _period_change(dates.year.to_numpy())
+    yearly_multiplier = np.cumprod(np.where(year_change, 1 + annual_increase / 100.0, 1.0))
+    return np.where(month_change, monthly_topup * yearly_multiplier, 0.0)
+
+@njit(cache=True, fastmath=_FASTMATH)
+def _simulate(prices, cash_injections, rebalance_mask, target_weights, initial):
+    """
+    Compiled day-by-day simulation kernel.
+
+    Returns:
+        tuple: (daily portfolio values, final holdings per asset, final cash).
+    """
+    num_days, num_assets = prices.shape
+    values = np.empty(num_days)
+    holdings = np.zeros(num_assets)
+    cash = initial
+
+    for i in range(num_days):
+        # Scheduled cash injection (zero on most days)
+        cash += cash_injections[i]
+
+        # --- Check for Rebalance or Initial Investment ---
+        if rebalance_mask[i]:
+            # --- Deploy Cash ---
+            # Calculate total value to be invested (current holdings + cash)
+            market_value = 0.0
+            for k in range(num_assets):
+                market_value += holdings[k] * prices[i, k]
+            total_value = market_value + cash
+            cash = 0.0
+
+            # Re-calculate holdings based on new total value and target weights
+            for k in range(num_assets):
+                if prices[i, k] > 0: # Avoid division by zero
+                    holdings[k] = total_value * target_weights[k] / prices[i, k]
+
+        # --- Calculate Portfolio Value for the Day ---
+        market_value = 0.0
+        for k in range(num_assets):
+            market_value += holdings[k] * prices[i, k]
+        values[i] = market_value + cash
+
+    return values, holdings, cash
+
+# Compile (or load from the on-disk cache) at import time, so the first backtest
+# in a fresh Streamlit session doesn't pay the JIT cost.
+_simulate(np.ones((2, 1)), np.zeros(2), np.ones(2, dtype=np.bool_), np.ones(1), 1.0)
+
 def run_backtest(
-    data: pd.DataFrame, 
-    portfolio: Portfolio, 
+    data: pd.DataFrame,
+    portfolio: Portfolio,
     initial_investment: float,
     monthly_topup: float,
     annual_increase: float
@@ -11,6 +76,9 @@ def run_backtest(
     """
     Runs an iterative, day-by-day backtest with rebalancing and scheduled investment logic.
 
+    Prices are held as a NumPy array (days x assets), and the cash schedule and rebalance
+    days are precomputed from the index; the simulation itself runs in a Numba-compiled kernel.
+
     Args:
         data (pd.DataFrame): DataFrame of historical prices for the assets.
         portfolio (Portfolio): A Portfolio object defining target weights and rebalancing strategy.
@@ -21,53 +89,30 @@ def run_backtest(
     Returns:
         pd.DataFrame: A DataFrame with the portfolio's value over time.
     """
-    holdings = {ticker: 0.0 for ticker in data.columns}
-    cash = float(initial_investment)
-    current_monthly_topup = float(monthly_topup)
-    
-    portfolio_history = []
-    last_month = None
-    last_year = None
-
-    # --- Main Simulation Loop ---
-    for current_date, prices in data.iterrows():
-        # --- Handle Date Changes ---
-        # Yearly increase for the monthly top-up amount
-        if last_year is not None and current_date.year > last_year:
-            current_monthly_topup *= (1 + annual_increase / 100.0)
-        
-        # Monthly cash injection
-        if last_month is not None and current_date.month != last_month:
-            cash += current_monthly_topup
-        
-        last_month = current_date.month
-        last_year = current_date.year
-        
-        # --- Check for Rebalance or Initial Investment ---
-        # A rebalance is triggered by the portfolio's strategy, or on the very first day.
-        is_first_day = not portfolio_history
-        is_rebalance_day = portfolio.should_rebalance(current_date)
-        
-        if is_first_day or is_rebalance_day:
-            # --- Deploy Cash ---
-            # Calculate total value to be invested (current holdings + cash)
-            market_value = sum(holdings[ticker] * prices[ticker] for ticker in holdings)
-            total_value = market_value + cash
-            cash = 0.0
+    tickers = list(data.columns)
+    prices = np.ascontiguousarray(data.values, dtype=np.float64)
+    dates = pd.DatetimeIndex(data.index)
 
-            # Re-calculate holdings based on new total value and target weights
-            for ticker, target_weight in portfolio.target_weights.items():
-                if prices[ticker] > 0: # Avoid division by zero
-                    amount_to_invest = total_value * target_weight
-                    holdings[ticker] = amount_to_invest / prices[ticker]
-        
-        # --- Calculate Portfolio Value for the Day ---
-        current_market_value = sum(holdings[ticker] * prices[ticker] for ticker in holdings)
-        total_portfolio_value = current_market_value + cash
-        portfolio_history.append({'Date': current_date, 'Portfolio Value': total_portfolio_value})
+    # --- Precompute Calendar Events ---
+    cash_injections = _cash_schedule(dates, float(monthly_topup), float(annual_increase))
+
+    # A rebalance is triggered by the portfolio's strategy, or on the very first day.
+    rebalance_mask = portfolio.rebalance_mask(dates)
+    rebalance_mask[:1] = True
+
+    target_weights = np.array([portfolio.target_weights.get(ticker, 0.0) for ticker in tickers], dtype=np.float64)
+
+    portfolio_values, holdings, cash = _simulate(
+        prices,
+        cash_injections,
+        rebalance_mask,
+        target_weights,
+        float(initial_investment),
+    )
 
     # --- Format and Return Results ---
-    result_df = pd.DataFrame(portfolio_history)
-    result_df.set_index('Date', inplace=True)
-    
-    return result_df, holdings, cash
+    result_df = pd.DataFrame({'Portfolio Value': portfolio_values}, index=data.index)
+    result_df.index.name = 'Date'
+    final_holdings = dict(zip(tickers, holdings.tolist()))
+
+    return result_df, final_holdings, cash
@@ -1,54 +1,116 @@
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import numpy as np
+from numba import njit, prange
+
+from .engine import _FASTMATH
+
+# Paths per random stream; fixed so a seed gives the same paths on any number of cores.
+_PATHS_PER_STREAM = 64
+
+def _fill_standard_normal(out: np.ndarray, seed=None):
+    """
+    Fills `out` (num_simulations x num_days) with standard normal draws.
+
+    Each block of paths gets its own Philox stream (jumped ahead from a common seed),
+    and blocks are filled concurrently; NumPy releases the GIL while filling.
+    """
+    bit_generator = np.random.Philox(seed)
+    starts = range(0, len(out), _PATHS_PER_STREAM)
+    generators = [np.random.Generator(bit_generator.jumped(j)) for j in range(len(starts))]
+
+    def fill(j):
+        start = starts[j]
+        generators[j].standard_normal(out=out[start:start + _PATHS_PER_STREAM])
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+        list(pool.map(fill, range(len(starts))))
+
+@njit(parallel=True, fastmath=_FASTMATH, cache=True)
+def _simulate_paths(mu, sigma, initial_value, paths):
+    """
+    Compiled Monte Carlo kernel; paths are spread across cores with prange.
 
-def run_monte_carlo_simulation(historical_returns: pd.Series, projection_years: int, initial_value: float, num_simulations: int = 500):
+    Turns each row of standard normal draws in `paths` (num_simulations x num_days)
+    into a compounded value path, in place.
+    """
+    num_simulations, num_days = paths.shape
+    for s in prange(num_simulations):
+        value = initial_value
+        for t in range(num_days):
+            value *= 1.0 + mu + sigma * paths[s, t]
+            paths[s, t] = value
+
+# Streamlit runs each session's script on its own thread, and Numba's default
+# 'workqueue' threading layer aborts the process if parallel kernels are launched
+# concurrently, so launches of _simulate_paths are serialized.
+_SIMULATE_PATHS_LOCK = threading.Lock()
+
+# Compile (or load from the on-disk cache) at import time, so the first projection
+# doesn't pay the JIT cost.
+with _SIMULATE_PATHS_LOCK:
+    _simulate_paths(0.0, 0.0, 1.0, np.zeros((1, 1)))
+
+def run_monte_carlo_simulation(asset_returns: pd.DataFrame, weights: dict, projection_years: int, initial_value: float, num_simulations: int = 500, seed=None):
     """
     Runs a Monte Carlo simulation to project future portfolio returns.
 
+    Daily asset returns are modelled as a multivariate normal fitted to the historical
+    returns and combined with the portfolio weights, so cross-asset correlation is
+    carried into the projection.
+
     Args:
-        historical_returns (pd.Series): A series of historical daily returns of the portfolio.
+        asset_returns (pd.DataFrame): Historical daily returns of each asset in the portfolio.
+        weights (dict): A dictionary mapping tickers to their weights.
         projection_years (int): The number of years to project into the future.
         initial_value (float): The last known value of the portfolio, to start the simulation from.
         num_simulations (int): The number of simulation paths to generate.
+        seed (int, optional): Seed for reproducible paths. Defaults to fresh entropy on every run.
 
     Returns:
         pd.DataFrame: A DataFrame containing the simulation results, with columns for different quantiles.
     """
     # Calculate historical statistical properties
-    mu = historical_returns.mean()
-    sigma = historical_returns.std()
-    
+    weights_vector = np.array([weights.get(ticker, 0.0) for ticker in asset_returns.columns], dtype=np.float64)
+    mu = asset_returns.mean().to_numpy(dtype=np.float64)
+    cov_matrix = asset_returns.cov().to_numpy(dtype=np.float64)
+
     num_days = projection_years * 252  # 252 trading days in a year
-    
-    # Initialize results matrix
-    simulation_results = np.zeros((num_days, num_simulations))
-    
-    # Run simulations
-    for i in range(num_simulations):
-        next_price = initial_value
-        
-        # Generate random daily returns for the entire period
-        random_shocks = np.random.normal(mu, sigma, num_days)
-        
-        # Apply the shocks to create the price path
-        for j in range(num_days):
-            next_price *= (1 + random_shocks[j])
-            simulation_results[j, i] = next_price
-            
+
+    # --- Run Simulations ---
+    # The weighted sum of the asset returns is itself normal, with mean w . mu and variance
+    # w^T cov w, so each path only needs one draw per day. Too little history (or a zero
+    # price) leaves these non-finite; that is caught here, not passed into the kernel, and
+    # gives a NaN band rather than an error.
+    portfolio_mu = float(mu @ weights_vector)
+    portfolio_sigma = float(np.sqrt(max(weights_vector @ cov_matrix @ weights_vector, 0.0)))
+    simulation_results = np.empty((num_simulations, num_days))
+    if np.isfinite(portfolio_mu) and np.isfinite(portfolio_sigma):
+        _fill_standard_normal(simulation_results, seed)
+        with _SIMULATE_PATHS_LOCK:
+            _simulate_paths(portfolio_mu, portfolio_sigma, float(initial_value), simulation_results)
+    else:
+        simulation_results.fill(np.nan)
+
     # --- Process Results ---
     # Create a date index for the projected period
-    last_date = historical_returns.index[-1]
-    future_dates = pd.to_datetime([last_date + pd.DateOffset(days=x) for x in range(1, num_days + 1)])
-    
-    # Create a DataFrame from the simulation results
-    results_df = pd.DataFrame(simulation_results, index=future_dates)
-    
-    # Calculate quantiles for uncertainty bounds
-    forecast_df = pd.DataFrame(index=future_dates)
-    forecast_df['median'] = results_df.quantile(0.5, axis=1)
-    forecast_df['upper_bound_75'] = results_df.quantile(0.75, axis=1)
-    forecast_df['lower_bound_25'] = results_df.quantile(0.25, axis=1)
-    forecast_df['upper_bound_95'] = results_df.quantile(0.95, axis=1)
-    forecast_df['lower_bound_05'] = results_df.quantile(0.05, axis=1)
-    
+    last_date = asset_returns.index[-1]
+    future_dates = pd.date_range(start=last_date + pd.DateOffset(days=1), periods=num_days, freq='D')
+
+    # Calculate quantiles for uncertainty bounds in a single pass over the simulations
+    quantiles = np.quantile(simulation_results, [0.5, 0.75, 0.25, 0.95, 0.05], axis=0)
+    forecast_df = pd.DataFrame(
+        {
+            'median': quantiles[0],
+            'upper_bound_75': quantiles[1],
+            'lower_bound_25': quantiles[2],
+            'upper_bound_95': quantiles[3],
+            'lower_bound_05': quantiles[4],
+        },
+        index=future_dates
+    )
+
     return forecast_df
@@ -33,3 +33,34 @@ def calculate_max_drawdown(series):
     drawdown = (series - cumulative_max) / cumulative_max
     max_drawdown = drawdown.min()
     return max_drawdown
+
+def calculate_all_metrics(series, risk_free_rate=0.02):
+    """
+    Calculates CAGR, volatility, Sharpe Ratio and maximum drawdown in a single pass
+    over the series' underlying array.
+
+    Returns:
+        dict: Keys 'cagr', 'volatility', 'sharpe_ratio' and 'max_drawdown'.
+    """
+    values = series.to_numpy(dtype=np.float64)
+
+    num_days = (series.index[-1] - series.index[0]).days
+    if num_days == 0:
+        cagr = 0.0
+    else:
+        cagr = (values[-1] / values[0]) ** (1 / (num_days / 365.25)) - 1
+
+    daily_returns = np.diff(values) / values[:-1]
+    volatility = daily_returns.std(ddof=1) * np.sqrt(252) if len(daily_returns) > 1 else np.nan
+
+    sharpe_ratio = (cagr - risk_free_rate) / volatility if volatility != 0 else np.nan
+
+    running_max = np.maximum.accumulate(values)
+    max_drawdown = ((values - running_max) / running_max).min()
+
+    return {
+        'cagr': cagr,
+        'volatility': volatility,
+        'sharpe_ratio': sharpe_ratio,
+        'max_drawdown': max_drawdown
+    }
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 
@@ -14,14 +15,14 @@ def generate_contribution_plots(
         A tuple of two matplotlib Figure objects: (composition_fig, contribution_fig).
     """
     # --- Calculate Final Portfolio Composition ---
-    final_asset_values = {ticker: final_holdings[ticker] * final_prices[ticker] for ticker in final_holdings}
-    final_total_value = sum(final_asset_values.values())
-    
+    holdings = pd.Series(final_holdings, dtype=float)
+    final_asset_values = holdings * final_prices.reindex(holdings.index)
+
     # Filter out assets with negligible value for cleaner charts
-    final_asset_values = {k: v for k, v in final_asset_values.items() if v / final_total_value > 0.001}
-    
-    labels = final_asset_values.keys()
-    sizes = final_asset_values.values()
+    final_asset_values = final_asset_values[final_asset_values / final_asset_values.sum() > 0.001]
+
+    labels = final_asset_values.index
+    sizes = final_asset_values.values
 
     # --- 1. Composition Pie Chart ---
     comp_fig, comp_ax = plt.subplots()
@@ -30,20 +31,15 @@ def generate_contribution_plots(
     comp_ax.set_title("Final Portfolio Composition")
 
     # --- 2. Gain/Loss Contribution Bar Chart ---
-    # Approximate an asset's contribution to gain/loss
-    asset_contribution = {}
-    for ticker, final_value in final_asset_values.items():
-        # Approximate capital invested in this asset based on its target weight
-        capital_invested_in_asset = total_capital_invested * target_weights.get(ticker, 0)
-        gain_loss = final_value - capital_invested_in_asset
-        asset_contribution[ticker] = gain_loss
-        
-    contribution_df = pd.DataFrame.from_dict(asset_contribution, orient='index', columns=['Contribution'])
-    contribution_df.sort_values('Contribution', ascending=False, inplace=True)
-    
+    # Approximate an asset's contribution to gain/loss, using the capital invested in it
+    # based on its target weight
+    capital_invested = pd.Series(target_weights, dtype=float).reindex(labels, fill_value=0.0) * total_capital_invested
+    contribution = (final_asset_values - capital_invested).sort_values(ascending=False)
+
     cont_fig, cont_ax = plt.subplots()
-    colors = ['g' if x > 0 else 'r' for x in contribution_df['Contribution']]
-    contribution_df['Contribution'].plot(kind='bar', ax=cont_ax, color=colors)
+    colors = np.where(contribution.values > 0, 'g', 'r')
+    cont_ax.bar(contribution.index, contribution.values, color=colors)
+    cont_ax.tick_params(axis='x', labelrotation=90)
     cont_ax.set_ylabel("Gain / Loss Contribution")
     cont_ax.set_title("Asset Contribution to Overall Gain/Loss")
     plt.tight_layout()
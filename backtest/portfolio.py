@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 class Portfolio:
@@ -62,4 +63,32 @@ class Portfolio:
                 self._last_rebalance_date = current_date
                 return True
         
-        return False
\ No newline at end of file
+        return False
+
+    def rebalance_mask(self, index: pd.DatetimeIndex) -> np.ndarray:
+        """
+        Computes all rebalance days for a backtest up front, as a vectorized
+        equivalent of calling should_rebalance on every date in turn.
+
+        Args:
+            index (pd.DatetimeIndex): The trading dates of the backtest, in order.
+
+        Returns:
+            np.ndarray: A boolean array, True on each day a rebalance is due. The first day
+                        is never flagged; the initial buy acts as the first "balancing".
+        """
+        mask = np.zeros(len(index), dtype=bool)
+
+        # Rebalance on the first trading day of each new month, quarter or year
+        if self.rebalance_frequency == 'monthly':
+            periods = index.month.to_numpy()
+        elif self.rebalance_frequency == 'quarterly':
+            periods = index.quarter.to_numpy()
+        elif self.rebalance_frequency == 'annually':
+            periods = index.year.to_numpy()
+        else:
+            # No rebalancing for "buy and hold" strategy
+            return mask
+
+        mask[1:] = periods[1:] != periods[:-1]
+        return mask
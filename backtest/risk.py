@@ -1,7 +1,6 @@
 import pandas as pd
 import numpy as np
-import seaborn as sns
-import matplotlib.pyplot as plt
+import plotly.express as px
 
 def generate_risk_report(price_data: pd.DataFrame, weights: dict):
     """
@@ -20,18 +19,24 @@ def generate_risk_report(price_data: pd.DataFrame, weights: dict):
     # Ensure weights are in the same order as the price_data columns
     ordered_weights = np.array([weights[ticker] for ticker in price_data.columns])
     
-    # Calculate log returns: r_t = ln(P_t / P_{t-1})
-    log_returns = np.log(price_data / price_data.shift(1)).dropna()
+    # Calculate log returns: r_t = ln(P_t) - ln(P_{t-1})
+    log_prices = np.log(np.ascontiguousarray(price_data.values, dtype=np.float64))
+    log_returns = log_prices[1:] - log_prices[:-1]
+    log_returns = log_returns[np.isfinite(log_returns).all(axis=1)]
     
     # Exit if there are not enough returns to calculate covariance
     if len(log_returns) < 2:
         return None, None
         
     # Calculate Annualized Covariance Matrix
-    cov_matrix = log_returns.cov() * 252 # 252 trading days
+    cov_matrix = np.atleast_2d(np.cov(log_returns, rowvar=False)) * 252 # 252 trading days
     
-    # Calculate Correlation Matrix
-    corr_matrix = log_returns.corr()
+    # Calculate Correlation Matrix, labelled by ticker for the heatmap
+    corr_matrix = pd.DataFrame(
+        np.atleast_2d(np.corrcoef(log_returns, rowvar=False)),
+        index=price_data.columns,
+        columns=price_data.columns
+    )
     
     # --- Calculate Metrics ---
     # 1. Total Portfolio Volatility (Standard Deviation)
@@ -40,10 +45,10 @@ def generate_risk_report(price_data: pd.DataFrame, weights: dict):
     
     # 2. Eigenvalue Decomposition for Risk Drivers
     try:
-        eigenvalues, eigenvectors = np.linalg.eig(cov_matrix)
-        # Sort eigenvalues and remove potential floating point inaccuracies
-        eigenvalues = np.real(sorted(eigenvalues, reverse=True))
-        pc1_variance = (eigenvalues[0] / sum(eigenvalues))
+        # The covariance matrix is symmetric, so the real, ascending-sorted eigenvalues
+        # come straight from the symmetric solver; no eigenvectors are needed.
+        eigenvalues = np.linalg.eigvalsh(cov_matrix)
+        pc1_variance = (eigenvalues[-1] / eigenvalues.sum())
     except np.linalg.LinAlgError:
         pc1_variance = np.nan
 
@@ -53,14 +58,15 @@ def generate_risk_report(price_data: pd.DataFrame, weights: dict):
     }
 
     # --- Generate Correlation Matrix Figure ---
-    fig, ax = plt.subplots(figsize=(10, 8))
-    sns.heatmap(
-        corr_matrix, 
-        ax=ax,
-        annot=True, 
-        cmap='coolwarm', 
-        fmt=".2f"
+    # Plotly renders the annotated cells client-side, so no per-cell text layout runs here.
+    fig = px.imshow(
+        corr_matrix,
+        text_auto='.2f',
+        color_continuous_scale='RdBu_r',
+        zmin=-1,
+        zmax=1,
+        aspect='auto'
     )
-    ax.set_title("Portfolio Asset Correlation Matrix")
+    fig.update_layout(title="Portfolio Asset Correlation Matrix")
     
     return metrics, fig
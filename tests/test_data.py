@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest import data
+
+# A synthetic market: SPY trades throughout, ABNB only lists in December 2020.
+DATES = pd.bdate_range('2018-01-01', '2021-06-30')
+UNIVERSE = pd.DataFrame(
+    {
+        'SPY': 100.0 + np.arange(len(DATES)),
+        'ABNB': np.where(DATES >= pd.Timestamp('2020-12-10'), 150.0, np.nan),
+    },
+    index=DATES
+)
+
+@pytest.fixture
+def downloads(monkeypatch, tmp_path):
+    """Points the cache at a temp dir and replaces yf.download, recording each call's range."""
+    calls = []
+
+    def fake_download(tickers, start, end, **kwargs):
+        calls.append((pd.Timestamp(start), pd.Timestamp(end)))
+        rows = UNIVERSE.loc[(UNIVERSE.index >= start) & (UNIVERSE.index < end), list(tickers)]
+        return pd.concat({'Close': rows}, axis=1)
+
+    monkeypatch.setattr(data, 'CACHE_DIR', tmp_path)
+    monkeypatch.setattr(data.yf, 'download', fake_download)
+    return calls
+
+def test_extend_left_with_young_ticker(downloads):
+    tickers = ['SPY', 'ABNB']
+    data._fetch_cached(tickers, '2020-01-01', '2021-06-30')
+
+    # ABNB has no prices before its listing, which is valid data, not a failed download.
+    prices = data._fetch_cached(tickers, '2018-01-01', '2021-06-30')
+    assert prices.index[0] == pd.Timestamp('2018-01-01')
+    expected = UNIVERSE.loc[UNIVERSE.index < '2021-06-30', 'SPY']
+    assert prices.index.equals(expected.index)
+    np.testing.assert_array_equal(prices['SPY'].to_numpy(), expected.to_numpy())
+    assert prices.loc[:'2020-12-09', 'ABNB'].isna().all()
+
+    # The extended range is now recorded as covered, so nothing is downloaded again.
+    num_calls = len(downloads)
+    data._fetch_cached(tickers, '2018-01-01', '2021-06-30')
+    assert len(downloads) == num_calls
+
+def test_failed_extension_raises(downloads, monkeypatch):
+    tickers = ['SPY', 'ABNB']
+    data._fetch_cached(tickers, '2020-01-01', '2021-06-30')
+
+    # yfinance reports network errors as an empty frame rather than raising.
+    monkeypatch.setattr(data.yf, 'download', lambda *args, **kwargs: pd.DataFrame())
+    with pytest.raises(ValueError):
+        data._fetch_cached(tickers, '2018-01-01', '2021-06-30')